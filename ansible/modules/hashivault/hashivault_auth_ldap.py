@@ -1,9 +1,11 @@
 #!/usr/bin/env python
+import os
+import time
+
 from ansible.module_utils.hashivault import hashivault_argspec
 from ansible.module_utils.hashivault import hashivault_auth_client
 from ansible.module_utils.hashivault import hashivault_init
 from ansible.module_utils.hashivault import hashiwrapper
-from hvac.exceptions import InvalidPath
 
 ANSIBLE_METADATA = {'status': ['stableinterface'], 'supported_by': 'community', 'version': '1.1'}
 DOCUMENTATION = '''
@@ -13,6 +15,9 @@ version_added: "3.17.7"
 short_description: Hashicorp Vault ldap configuration module
 description:
     - Module to configure the LDAP authentication method in Hashicorp Vault.
+    - Set the environment variable HASHIVAULT_CONFIG_CACHE=1 to reuse a configuration read from the same Vault,
+      namespace and mount point for up to 60 seconds when several runs share one worker process. Cached entries are
+      only cleared by a configure from that same process, so changes made elsewhere may go unnoticed until they expire.
 options:
     mount_point:
         description:
@@ -115,9 +120,11 @@ EXAMPLES = '''
 '''
 
 
-def main():
-    # separate long default value to pass linting
-    default_group_filter = '(|(memberUid={{.Username}})(member={{.UserDN}})(uniqueMember={{.UserDN}}))'
+# separate long default value to pass linting
+DEFAULT_GROUP_FILTER = '(|(memberUid={{.Username}})(member={{.UserDN}})(uniqueMember={{.UserDN}}))'
+
+
+def _build_argspec():
     argspec = hashivault_argspec()
     argspec['description'] = dict(required=False, type='str')
     argspec['mount_point'] = dict(required=False, type='str', default='ldap')
@@ -135,13 +142,50 @@ def main():
     argspec['discover_dn'] = dict(required=False, type='bool', default=False)
     argspec['deny_null_bind'] = dict(required=False, type='bool', default=True)
     argspec['upn_domain'] = dict(required=False, type='str', default='')
-    argspec['group_filter'] = dict(required=False, type='str', default=default_group_filter)
+    argspec['group_filter'] = dict(required=False, type='str', default=DEFAULT_GROUP_FILTER)
     argspec['group_attr'] = dict(required=False, type='str', default='cn')
     argspec['group_dn'] = dict(required=False, type='str', default='')
     argspec['use_token_groups'] = dict(required=False, type='bool', default=False)
     argspec['token_ttl'] = dict(required=False, type='int', default=0)
     argspec['token_max_ttl'] = dict(required=False, type='int', default=0)
+    return argspec
+
+
+_ARGSPEC = _build_argspec()
+
+# parameters sent to vault under the same name they have in the argspec
+_PASSTHROUGH = (
+    'mount_point', 'case_sensitive_names', 'starttls', 'tls_min_version', 'tls_max_version', 'insecure_tls',
+    'certificate', 'bind_dn', 'user_attr', 'user_dn', 'discover_dn', 'deny_null_bind', 'upn_domain',
+    'group_filter', 'group_attr', 'group_dn', 'use_token_groups', 'token_ttl', 'token_max_ttl',
+)
+
+# keys vault reports back and that take part in drift detection (mount_point and bind_pass never do)
+_COMPARABLE_KEYS = frozenset(_PASSTHROUGH + ('url',)) - {'mount_point'}
 
+# (vault url, namespace, mount point) -> (read time, configuration), only used with HASHIVAULT_CONFIG_CACHE=1
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_TTL = 60
+
+
+def _config_cache_key(client, params, mount_point):
+    return (client.url, params.get('namespace'), mount_point)
+
+
+def _read_configuration(client, params, mount_point):
+    if os.environ.get('HASHIVAULT_CONFIG_CACHE') != '1':
+        return client.auth.ldap.read_configuration(mount_point=mount_point)['data']
+    key = _config_cache_key(client, params, mount_point)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and time.time() - cached[0] < _CONFIG_CACHE_TTL:
+        return cached[1]
+    result = client.auth.ldap.read_configuration(mount_point=mount_point)['data']
+    _CONFIG_CACHE[key] = (time.time(), result)
+    return result
+
+
+def main():
+    argspec = dict(_ARGSPEC)
     module = hashivault_init(argspec, supports_check_mode=True)
     result = hashivault_auth_ldap(module)
     if result.get('failed'):
@@ -154,39 +198,18 @@ def main():
 def hashivault_auth_ldap(module):
     params = module.params
     client = hashivault_auth_client(params)
-    changed = False
-    desired_state = dict()
-    desired_state['mount_point'] = params.get('mount_point')
-    desired_state['url'] = params.get('ldap_url')
-    desired_state['case_sensitive_names'] = params.get('case_sensitive_names')
-    desired_state['starttls'] = params.get('starttls')
-    desired_state['tls_min_version'] = params.get('tls_min_version')
-    desired_state['tls_max_version'] = params.get('tls_max_version')
-    desired_state['insecure_tls'] = params.get('insecure_tls')
-    desired_state['certificate'] = params.get('certificate')
-    desired_state['bind_dn'] = params.get('bind_dn')
-    desired_state['bind_pass'] = params.get('bind_pass')
-    desired_state['user_attr'] = params.get('user_attr')
-    desired_state['user_dn'] = params.get('user_dn')
-    desired_state['discover_dn'] = params.get('discover_dn')
-    desired_state['deny_null_bind'] = params.get('deny_null_bind')
-    desired_state['upn_domain'] = params.get('upn_domain')
-    desired_state['group_filter'] = params.get('group_filter')
-    desired_state['group_attr'] = params.get('group_attr')
-    desired_state['group_dn'] = params.get('group_dn')
-    desired_state['use_token_groups'] = params.get('use_token_groups')
-    desired_state['token_ttl'] = params.get('token_ttl')
-    desired_state['token_max_ttl'] = params.get('token_max_ttl')
-
-    # if bind pass is None, remove it from desired state since we can't compare
-    if desired_state['bind_pass'] is None:
-        del desired_state['bind_pass']
+    desired_state = {k: params[k] for k in _PASSTHROUGH}
+    desired_state['url'] = params['ldap_url']
+    # only send bind pass when given since vault never returns it and we can't compare
+    bind_pass = params['bind_pass']
+    if bind_pass is not None:
+        desired_state['bind_pass'] = bind_pass
 
     # check current config
     current_state = dict()
+    from hvac.exceptions import InvalidPath
     try:
-        result = client.auth.ldap.read_configuration(
-            mount_point=desired_state['mount_point'])['data']
+        result = _read_configuration(client, params, desired_state['mount_point'])
         # some keys need to be remapped to match desired state (and HVAC implementation)
         current_state['discover_dn'] = result['discoverdn']
         current_state['group_attr'] = result['groupattr']
@@ -211,15 +234,22 @@ def hashivault_auth_ldap(module):
         pass
 
     # check if current config matches desired config values, if they match, set changed to false to prevent action
-    for k, v in current_state.items():
-        if v != desired_state[k]:
-            changed = True
+    changed = bool(current_state) and any(desired_state[k] != current_state[k] for k in _COMPARABLE_KEYS)
 
     # if configs dont match and checkmode is off, complete the change
     if changed and not module.check_mode:
         client.auth.ldap.configure(**desired_state)
+        _CONFIG_CACHE.pop(_config_cache_key(client, params, desired_state['mount_point']), None)
 
-    return {'changed': changed}
+    result = {'changed': changed}
+    # only ship both configurations back when --diff was requested, limited to the keys that are compared
+    if module._diff:
+        after = dict((k, desired_state[k]) for k in _COMPARABLE_KEYS)
+        result['diff'] = {
+            "before": current_state,
+            "after": after,
+        }
+    return result
 
 
 if __name__ == '__main__':